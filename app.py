@@ -6,9 +6,14 @@ highlighted clause titles, light executive summary box, and logo header/footer.
 """
 
 import streamlit as st
+import fitz  # PyMuPDF
 import PyPDF2
 import docx
-from openai import OpenAI
+import asyncio
+import threading
+import tiktoken
+from openai import OpenAI, AsyncOpenAI, APIError
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from datetime import datetime
 from reportlab.lib.pagesizes import A4
@@ -20,9 +25,15 @@ from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.ttfonts import TTFont, TTFError
 import re
 import os
+import json
+import logging
+import sqlite3
+import hashlib
+from contextlib import closing
+from pathlib import Path
 from dotenv import load_dotenv
 
 # -----------------------------
@@ -31,14 +42,24 @@ from dotenv import load_dotenv
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 client = OpenAI(api_key=OPENAI_API_KEY)
+async_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+logger = logging.getLogger(__name__)
 LOGO_PATH = "company_logo.png"
 
-# Register clean professional font
-try:
-    pdfmetrics.registerFont(TTFont("Arial", "arial.ttf"))
-    FONT_NAME = "Arial"
-except:
-    FONT_NAME = "Helvetica"
+# Clean professional font, registered lazily so worker processes that
+# import this module also get a registration in their own process.
+FONT_NAME = "Helvetica"
+
+def _ensure_font():
+    global FONT_NAME
+    if "Arial" in pdfmetrics.getRegisteredFontNames():
+        FONT_NAME = "Arial"
+        return
+    try:
+        pdfmetrics.registerFont(TTFont("Arial", "arial.ttf"))
+        FONT_NAME = "Arial"
+    except (TTFError, OSError):
+        FONT_NAME = "Helvetica"
 
 # -----------------------------
 # CLAUSE TABLE
@@ -54,22 +75,9 @@ CLAUSE_TABLE = """
 8. Intellectual Property (IP) Rights
 """
 
-# -----------------------------
-# TEXT EXTRACTION
-# -----------------------------
-def extract_text_from_pdf(file):
-    reader = PyPDF2.PdfReader(file)
-    return "\n".join(page.extract_text() or "" for page in reader.pages)
-
-def extract_text_from_docx(file):
-    doc = docx.Document(file)
-    return "\n".join(p.text for p in doc.paragraphs)
-
-# -----------------------------
-# GPT ANALYSIS
-# -----------------------------
-def analyze_tender_with_clauses(tender_text):
-    prompt = f"""
+# Static instructions come first so the provider can cache the shared
+# prefix; only the tender text varies per request.
+SYSTEM_PROMPT = f"""
 You are a senior contracts lawyer preparing a professional tender analysis report.
 
 For each clause below, write in formal English with this structure:
@@ -87,24 +95,306 @@ Recommended Action (Proceed / Proceed with Caution / Avoid Bid)
 
 No emojis, no markdown symbols.
 
-TENDER TEXT:
-{tender_text[:15000]}
+CLAUSES TO REVIEW:
+{CLAUSE_TABLE}
+"""
+
+MERGE_PROMPT = f"""
+You are a senior contracts lawyer consolidating clause analyses of one tender.
+
+The user message contains clause-by-clause analyses of consecutive parts of a
+single tender document. Merge them into one report in formal English, keeping
+this structure for each clause:
+
+Clause Title: [title]
+Findings: [combined findings across all parts]
+Risk Level: [Low / Medium / High]
+Action Advice: [short, practical recommendation]
+
+At the end, include:
+Executive Summary
+Overall Risk Rating
+Top 3 Concerns
+Recommended Action (Proceed / Proceed with Caution / Avoid Bid)
+
+No emojis, no markdown symbols.
 
 CLAUSES TO REVIEW:
 {CLAUSE_TABLE}
 """
+
+# Chunking parameters for tenders too long for a single request
+CHUNK_SIZE = 12000
+CHUNK_OVERLAP = 1000
+MAX_CONCURRENT_CHUNKS = 5
+
+# Cap model input by tokens rather than characters: character counts are a
+# poor proxy (CJK text and tables tokenize much denser than prose).
+try:
+    _ENCODER = tiktoken.encoding_for_model("gpt-4.1-mini")
+except KeyError:
+    _ENCODER = tiktoken.get_encoding("o200k_base")
+MODEL_CONTEXT_TOKENS = 1_000_000
+# Output length is roughly deterministic: 8 clauses x ~150 tokens plus a
+# ~300-token summary, so 1500 covers the worst case with headroom.
+MAX_COMPLETION_TOKENS = 1500
+_PROMPT_OVERHEAD = len(_ENCODER.encode(SYSTEM_PROMPT)) + 32  # message framing
+TOKEN_BUDGET = MODEL_CONTEXT_TOKENS - _PROMPT_OVERHEAD - MAX_COMPLETION_TOKENS
+
+def _trim_to_tokens(text, budget=TOKEN_BUDGET):
+    tokens = _ENCODER.encode(text)
+    if len(tokens) <= budget:
+        return text
+    return _ENCODER.decode(tokens[:budget])
+
+# -----------------------------
+# TEXT EXTRACTION
+# -----------------------------
+@st.cache_data(max_entries=8, show_spinner=False)
+def extract_text_from_pdf(data: bytes):
+    try:
+        doc = fitz.open(stream=data, filetype="pdf")
+        try:
+            return "\n".join(page.get_text("text") for page in doc)
+        finally:
+            doc.close()
+    except fitz.FileDataError:
+        # Fall back to PyPDF2 for files MuPDF refuses to parse; extract
+        # pages concurrently since this path is the slow one. PdfReader
+        # is not thread-safe (lazy object resolution seeks the shared
+        # stream), so each worker thread parses its own copy.
+        num_pages = len(PyPDF2.PdfReader(BytesIO(data)).pages)
+        local = threading.local()
+
+        def _page_text(idx):
+            reader = getattr(local, "reader", None)
+            if reader is None:
+                reader = local.reader = PyPDF2.PdfReader(BytesIO(data))
+            return reader.pages[idx].extract_text() or ""
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            return "\n".join(ex.map(_page_text, range(num_pages)))
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def extract_text_from_docx(data: bytes):
+    doc = docx.Document(BytesIO(data))
+    return "\n".join(p.text for p in doc.paragraphs)
+
+_EXTRACTORS = {
+    ".pdf": extract_text_from_pdf,
+    ".docx": extract_text_from_docx,
+}
+
+# -----------------------------
+# GPT ANALYSIS
+# -----------------------------
+ANALYSIS_CACHE_DIR = Path(".cache/analysis")
+
+def _tender_hash(tender_text):
+    return hashlib.blake2b(tender_text.encode(), digest_size=16).hexdigest()
+
+def get_cached_analysis(tender_text):
+    """Return a previously generated analysis for this exact text, or None."""
+    key = _tender_hash(tender_text)
+    cache = st.session_state.setdefault("analysis_cache", {})
+    if key in cache:
+        return cache[key]
+    path = ANALYSIS_CACHE_DIR / f"{key}.txt"
+    if path.exists():
+        analysis = path.read_text(encoding="utf-8")
+        cache[key] = analysis
+        return analysis
+    return None
+
+def _write_disk_cache(key, analysis):
+    try:
+        ANALYSIS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (ANALYSIS_CACHE_DIR / f"{key}.txt").write_text(analysis, encoding="utf-8")
+    except OSError:
+        pass  # disk cache is best-effort; session cache still holds the result
+
+def store_cached_analysis(tender_text, analysis):
+    key = _tender_hash(tender_text)
+    st.session_state.setdefault("analysis_cache", {})[key] = analysis
+    _write_disk_cache(key, analysis)
+
+def _split_into_chunks(text):
+    """Split on newline boundaries into ~CHUNK_SIZE pieces with overlap."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + CHUNK_SIZE
+        if end < len(text):
+            cut = text.rfind("\n", start + CHUNK_SIZE // 2, end)
+            if cut != -1:
+                end = cut
+        chunks.append(text[start:end])
+        if end >= len(text):
+            break
+        start = end - CHUNK_OVERLAP
+    return chunks
+
+async def _analyze_chunk(sem, chunk, idx, total):
+    async with sem:
+        for attempt in range(3):
+            try:
+                response = await async_client.chat.completions.create(
+                    model="gpt-4.1-mini",
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": f"TENDER TEXT (part {idx} of {total}):\n{chunk}"},
+                    ],
+                    temperature=0.3,
+                    max_tokens=MAX_COMPLETION_TOKENS
+                )
+                if response.usage:
+                    logger.info("chunk %d/%d completion_tokens=%d",
+                                idx, total, response.usage.completion_tokens)
+                return response.choices[0].message.content.strip()
+            except APIError:
+                if attempt == 2:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+
+async def _analyze_chunks(chunks):
+    sem = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+    tasks = [_analyze_chunk(sem, c, i, len(chunks)) for i, c in enumerate(chunks, 1)]
+    return await asyncio.gather(*tasks)
+
+def _stream_completion(messages):
     response = client.chat.completions.create(
         model="gpt-4.1-mini",
-        messages=[{"role": "user", "content": prompt}],
+        messages=messages,
         temperature=0.3,
-        max_tokens=1800
+        max_tokens=MAX_COMPLETION_TOKENS,
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+    for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+        if chunk.usage:
+            logger.info("completion_tokens=%d", chunk.usage.completion_tokens)
+
+def analyze_tender_with_clauses(tender_text):
+    """Yield the analysis incrementally as the model generates it.
+
+    Short tenders go out as a single streamed request. Longer ones are
+    split into overlapping chunks analyzed concurrently, then a final
+    streamed call merges the per-chunk findings into one report.
+    """
+    if len(tender_text) <= CHUNK_SIZE:
+        yield from _stream_completion([
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"TENDER TEXT:\n{_trim_to_tokens(tender_text)}"},
+        ])
+        return
+
+    chunks = _split_into_chunks(tender_text)
+    chunk_reports = asyncio.run(_analyze_chunks(chunks))
+    combined = "\n\n".join(
+        f"PART {i} ANALYSIS:\n{report}" for i, report in enumerate(chunk_reports, 1)
     )
-    return response.choices[0].message.content.strip()
+    yield from _stream_completion([
+        {"role": "system", "content": MERGE_PROMPT},
+        {"role": "user", "content": _trim_to_tokens(combined)},
+    ])
+
+# -----------------------------
+# BATCH API (overnight runs)
+# -----------------------------
+BATCH_DB_PATH = Path(".cache/batches.db")
+
+def _batch_db():
+    BATCH_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(BATCH_DB_PATH)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS pending_batches ("
+        "batch_id TEXT PRIMARY KEY, tender_hash TEXT, tender_name TEXT, created_at TEXT)"
+    )
+    return db
+
+def queue_tender_batch(tender_text, tender_name):
+    """Submit the analysis via the Batch API (half cost, 24h window)."""
+    key = _tender_hash(tender_text)
+    body = {
+        "model": "gpt-4.1-mini",
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"TENDER TEXT:\n{_trim_to_tokens(tender_text)}"},
+        ],
+        "temperature": 0.3,
+        "max_tokens": MAX_COMPLETION_TOKENS,
+    }
+    line = json.dumps(
+        {"custom_id": key, "method": "POST", "url": "/v1/chat/completions", "body": body}
+    )
+    upload = client.files.create(file=BytesIO(line.encode("utf-8")), purpose="batch")
+    batch = client.batches.create(
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+        input_file_id=upload.id,
+    )
+    with closing(_batch_db()) as db, db:
+        db.execute(
+            "INSERT OR REPLACE INTO pending_batches VALUES (?, ?, ?, ?)",
+            (batch.id, key, tender_name, datetime.now().isoformat()),
+        )
+    return batch.id
+
+def fetch_batch_results():
+    """Poll pending batches; cache finished analyses and report statuses."""
+    statuses = []
+    with closing(_batch_db()) as db, db:
+        rows = db.execute(
+            "SELECT batch_id, tender_hash, tender_name FROM pending_batches"
+        ).fetchall()
+        for batch_id, key, tender_name in rows:
+            batch = client.batches.retrieve(batch_id)
+            status = batch.status
+            if status == "completed" and batch.output_file_id:
+                content = client.files.content(batch.output_file_id).text
+                for line in content.splitlines():
+                    record = json.loads(line)
+                    analysis = record["response"]["body"]["choices"][0]["message"]["content"].strip()
+                    _write_disk_cache(record.get("custom_id", key), analysis)
+                db.execute("DELETE FROM pending_batches WHERE batch_id = ?", (batch_id,))
+            elif status in ("completed", "failed", "expired", "cancelled"):
+                # Terminal but no usable output (e.g. every request
+                # errored); drop it so it isn't re-polled forever.
+                db.execute("DELETE FROM pending_batches WHERE batch_id = ?", (batch_id,))
+                status = "failed"
+            statuses.append((tender_name, status))
+    return statuses
 
 # -----------------------------
 # PDF GENERATION
 # -----------------------------
+_MD_STRIP_RE = re.compile(r"\*\*|##")
+
+def _split_clause_blocks(clause_text):
+    """Split on the literal clause marker, keeping it on each block."""
+    if "Clause Title:" not in clause_text:
+        return [clause_text]
+    head, *parts = clause_text.split("Clause Title:")
+    return [head] + [f"Clause Title:{p}" for p in parts if p.strip()]
+
+# Read the static logo once; each report still needs a fresh Image
+# flowable, but the disk read and decode happen only at import.
+try:
+    with open(LOGO_PATH, "rb") as f:
+        _LOGO_BYTES = f.read()
+except OSError:
+    _LOGO_BYTES = None
+
+@st.cache_data(max_entries=8, show_spinner=False)
 def generate_pdf_report(tender_name, analysis_text, reviewer_comment):
+    _ensure_font()
+    # Format timestamps once; the footer callback fires per page and
+    # should show the same time on every page.
+    now = datetime.now()
+    date_str = now.strftime('%B %d, %Y')
+    footer_str = f"Generated by Tender Analyzer | {now.strftime('%d-%b-%Y %H:%M')}"
     buffer = BytesIO()
     doc = SimpleDocTemplate(
         buffer, pagesize=A4,
@@ -128,35 +418,38 @@ def generate_pdf_report(tender_name, analysis_text, reviewer_comment):
     story = []
 
     # Add logo
-    try:
-        img = Image(LOGO_PATH, width=1.2*inch, height=1.2*inch)
+    if _LOGO_BYTES is not None:
+        img = Image(BytesIO(_LOGO_BYTES), width=1.2*inch, height=1.2*inch)
         img.hAlign = 'CENTER'
         story.append(img)
         story.append(Spacer(1, 0.2*inch))
-    except Exception:
-        pass
 
     # Title
-    story.append(Paragraph("TENDER LEGAL REVIEW REPORT", title))
-    story.append(Spacer(1, 0.15*inch))
-    story.append(Paragraph(f"Tender: {tender_name}", body))
-    story.append(Paragraph(f"Date: {datetime.now().strftime('%B %d, %Y')}", body))
-    story.append(Spacer(1, 0.3*inch))
+    story.extend([
+        Paragraph("TENDER LEGAL REVIEW REPORT", title),
+        Spacer(1, 0.15*inch),
+        Paragraph(f"Tender: {tender_name}", body),
+        Paragraph(f"Date: {date_str}", body),
+        Spacer(1, 0.3*inch),
+    ])
 
     # Split analysis and summary
-    if "Executive Summary" in analysis_text:
-        parts = analysis_text.split("Executive Summary")
-        clause_text = parts[0]
-        exec_summary = "Executive Summary" + parts[1] if len(parts) > 1 else ""
-    else:
-        clause_text, exec_summary = analysis_text, ""
+    clause_text, sep, tail = analysis_text.partition("Executive Summary")
+    exec_summary = (sep + tail) if sep else ""
 
     # Format clause sections
-    story.append(Paragraph("Detailed Clause Analysis", header))
-    story.append(Spacer(1, 0.1*inch))
-
-    # Regex to detect clause titles
-    clause_blocks = re.split(r"(?=Clause Title:)", clause_text)
+    story.extend([
+        Paragraph("Detailed Clause Analysis", header),
+        Spacer(1, 0.1*inch),
+    ])
+
+    # Fuse all clauses into one table so Platypus lays them out in a
+    # single pass instead of measuring each paragraph independently.
+    # Locals are hoisted out of the loop to skip per-iteration lookups.
+    clause_blocks = _split_clause_blocks(clause_text)
+    rows = []
+    title_rows = []
+    P, cts, b = Paragraph, clause_title_style, body
     for block in clause_blocks:
         block = block.strip()
         if not block:
@@ -165,16 +458,31 @@ def generate_pdf_report(tender_name, analysis_text, reviewer_comment):
         # Extract title if present
         if block.startswith("Clause Title:"):
             title_line, _, remainder = block.partition("\n")
-            story.append(Paragraph(title_line.strip(), clause_title_style))
-            story.append(Paragraph(remainder.strip(), body))
+            title_rows.append(len(rows))
+            rows.extend([[P(title_line.strip(), cts)], [P(remainder.strip(), b)]])
         else:
-            story.append(Paragraph(block, body))
+            rows.append([P(block, b)])
+
+    if rows and not title_rows:
+        # Degraded output with no clause markers: table cells only
+        # split between rows, so one oversized cell would raise a
+        # LayoutError. Flow plain paragraphs across pages instead.
+        story.extend(row[0] for row in rows)
+    elif rows:
+        clause_style = [
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ]
+        for i in title_rows:
+            clause_style.append(('BACKGROUND', (0, i), (0, i), colors.HexColor("#1A237E")))
+        clause_table = Table(rows, colWidths=[6.5 * inch])
+        clause_table.setStyle(TableStyle(clause_style))
+        story.append(clause_table)
 
     # Executive Summary Box
     if exec_summary.strip():
-        story.append(Spacer(1, 0.25*inch))
-        story.append(Paragraph("Executive Summary", header))
-        clean_summary = exec_summary.strip().replace("**", "").replace("##", "")
+        clean_summary = _MD_STRIP_RE.sub("", exec_summary.strip())
         data = [[Paragraph(clean_summary, body)]]
         table = Table(data, colWidths=[6.0 * inch])
         table.setStyle(TableStyle([
@@ -182,13 +490,19 @@ def generate_pdf_report(tender_name, analysis_text, reviewer_comment):
             ('BOX', (0, 0), (-1, -1), 0.5, colors.grey),
             ('INNERPADDING', (0, 0), (-1, -1), 8),
         ]))
-        story.append(table)
+        story.extend([
+            Spacer(1, 0.25*inch),
+            Paragraph("Executive Summary", header),
+            table,
+        ])
 
     # Reviewer Comments
     if reviewer_comment.strip():
-        story.append(Spacer(1, 0.3*inch))
-        story.append(Paragraph("Reviewer Comments", header))
-        story.append(Paragraph(reviewer_comment.strip(), body))
+        story.extend([
+            Spacer(1, 0.3*inch),
+            Paragraph("Reviewer Comments", header),
+            Paragraph(reviewer_comment.strip(), body),
+        ])
 
     # Disclaimer
     story.append(Spacer(1, 0.4*inch))
@@ -201,13 +515,13 @@ def generate_pdf_report(tender_name, analysis_text, reviewer_comment):
     def add_footer(canvas, doc):
         canvas.saveState()
         canvas.setFont(FONT_NAME, 8)
-        footer_text = f"Generated by Tender Analyzer | {datetime.now().strftime('%d-%b-%Y %H:%M')}"
-        canvas.drawCentredString(A4[0] / 2.0, 0.5 * inch, footer_text)
+        canvas.drawCentredString(A4[0] / 2.0, 0.5 * inch, footer_str)
         canvas.restoreState()
 
     doc.build(story, onFirstPage=add_footer, onLaterPages=add_footer)
-    buffer.seek(0)
-    return buffer
+    pdf_bytes = buffer.getvalue()
+    del buffer
+    return pdf_bytes
 
 # -----------------------------
 # STREAMLIT UI
@@ -222,35 +536,81 @@ def main():
         st.info("Please upload a tender document to begin.")
         st.stop()
 
-    text = extract_text_from_pdf(file) if file.name.endswith(".pdf") else extract_text_from_docx(file)
+    ext = os.path.splitext(file.name)[1].lower()
+    extractor = _EXTRACTORS.get(ext)
+    if extractor is None:
+        st.error(f"Unsupported file type: {ext}")
+        st.stop()
+
+    text = extractor(file.getvalue())
     if not text:
         st.error("Could not extract text from file.")
         st.stop()
 
     st.success(f"Extracted {len(text):,} characters from {file.name}")
 
+    batch_mode = st.checkbox(
+        "Queue for overnight batch (half cost, results within 24 hours)"
+    )
+
     if st.button("Analyze Tender", type="primary", use_container_width=True):
-        with st.spinner("Analyzing tender using GPT-4.1-mini..."):
-            analysis = analyze_tender_with_clauses(text)
+        if batch_mode:
+            batch_id = queue_tender_batch(text, file.name)
+            st.success(f"Queued batch {batch_id}. Use 'Fetch batch results' once it completes.")
+            st.stop()
+        analysis = get_cached_analysis(text)
+        if analysis is None:
+            placeholder = st.empty()
+            acc = ""
+            for delta in analyze_tender_with_clauses(text):
+                acc += delta
+                placeholder.markdown(acc)
+            analysis = acc.strip()
+            placeholder.empty()
+            store_cached_analysis(text, analysis)
         st.session_state.analysis = analysis
         st.session_state.tender_name = file.name
         st.session_state.done = True
+        # Drop any PDF prepared for a previous tender so the download
+        # button cannot serve a stale report.
+        st.session_state.pop("pdf_bytes", None)
+
+    if st.button("Fetch batch results", use_container_width=True):
+        statuses = fetch_batch_results()
+        if not statuses:
+            st.info("No pending batches.")
+        for tender_name, status in statuses:
+            if status == "completed":
+                st.success(f"{tender_name}: completed — re-upload and analyze to load it from cache.")
+            elif status == "failed":
+                st.error(f"{tender_name}: batch failed and was removed from the queue.")
+            else:
+                st.write(f"{tender_name}: {status}")
 
     if st.session_state.get("done"):
         st.subheader("Tender Analysis Result")
         st.markdown(st.session_state.analysis)
 
         st.markdown("---")
-        reviewer_comment = st.text_area("Reviewer Comments (optional):", placeholder="Add internal remarks or observations.")
-        pdf_buf = generate_pdf_report(st.session_state.tender_name, st.session_state.analysis, reviewer_comment)
-
-        st.download_button(
-            "Download PDF Report",
-            pdf_buf,
-            file_name=f"tender_analysis_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-            mime="application/pdf",
-            use_container_width=True
-        )
+        # The form defers reruns until submit, so typing in the text
+        # area no longer rebuilds the PDF on every keystroke.
+        with st.form("review_form"):
+            reviewer_comment = st.text_area("Reviewer Comments (optional):", placeholder="Add internal remarks or observations.")
+            prepare = st.form_submit_button("Prepare PDF Report", use_container_width=True)
+
+        if prepare:
+            st.session_state.pdf_bytes = generate_pdf_report(
+                st.session_state.tender_name, st.session_state.analysis, reviewer_comment
+            )
+
+        if st.session_state.get("pdf_bytes") is not None:
+            st.download_button(
+                "Download PDF Report",
+                st.session_state.pdf_bytes,
+                file_name=f"tender_analysis_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
 
 if __name__ == "__main__":
     main()